@@ -0,0 +1,115 @@
+"""
+Concurrent Batch Pipeline
+Runs the billing-generation and cost-analysis pipeline for many
+profiles at once using asyncio
+"""
+import asyncio
+
+from billing_generator import generate_mock_billing_async, generate_mock_billing_streaming
+from cost_analyser import analyze_costs_and_recommend_async, analyze_costs_and_recommend_streaming
+
+async def run_pipeline_async(profile):
+    """
+    Run the full pipeline (billing generation + cost analysis) for one profile
+
+    Args:
+        profile: Project profile dictionary
+
+    Returns:
+        dict: {'profile': ..., 'billing_data': ..., 'report': ...}
+    """
+    billing_data = await generate_mock_billing_async(profile)
+    report = await analyze_costs_and_recommend_async(profile, billing_data)
+
+    return {
+        'profile': profile,
+        'billing_data': billing_data,
+        'report': report
+    }
+
+async def run_pipelines_async(profiles):
+    """
+    Run pipelines for all profiles concurrently
+
+    LLM calls are network-bound, so issuing the pipelines together
+    via asyncio.gather gives near-linear speedup in the number of
+    profiles, up to provider rate limits.
+
+    Args:
+        profiles: List of project profile dictionaries
+
+    Returns:
+        list: Pipeline results, one per profile (input order preserved)
+    """
+    return await asyncio.gather(*(run_pipeline_async(p) for p in profiles))
+
+def run_pipeline_streaming(profile):
+    """
+    Run one pipeline with streaming parsers to minimize latency
+
+    Billing records are parsed and validated while the first response
+    is still decoding, so the cost-analysis request goes out the moment
+    the billing array closes; the analysis response is then stream-
+    parsed the same way. The two LLM calls remain serial (the analysis
+    prompt depends on the complete billing data), but all local parse
+    and validation work overlaps the network receive.
+
+    Args:
+        profile: Project profile dictionary
+
+    Returns:
+        dict: {'profile': ..., 'billing_data': ..., 'report': ...}
+    """
+    billing_data = generate_mock_billing_streaming(profile)
+    report = analyze_costs_and_recommend_streaming(profile, billing_data)
+
+    return {
+        'profile': profile,
+        'billing_data': billing_data,
+        'report': report
+    }
+
+def run_pipelines(profiles):
+    """
+    Synchronous entry point for the concurrent batch pipeline
+
+    Args:
+        profiles: List of project profile dictionaries
+
+    Returns:
+        list: Pipeline results, one per profile
+    """
+    return asyncio.run(run_pipelines_async(profiles))
+
+if __name__ == "__main__":
+    # Test the module
+    import logging
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    print("Testing Batch Pipeline...")
+
+    test_profiles = [
+        {
+            "name": f"Test Project {i}",
+            "budget_inr_per_month": 3000 + i * 2000,
+            "description": "Test project for batch pipeline",
+            "tech_stack": {
+                "frontend": "react",
+                "backend": "nodejs",
+                "database": "mongodb",
+                "proxy": "nginx",
+                "hosting": "aws"
+            },
+            "non_functional_requirements": ["scalability"]
+        }
+        for i in range(1, 3)
+    ]
+
+    try:
+        results = run_pipelines(test_profiles)
+        print(f"\n✅ Batch pipeline successful! {len(results)} profiles processed")
+        for result in results:
+            summary = result['report']['summary']
+            print(f"  - {result['profile']['name']}: "
+                  f"{summary['recommendations_count']} recommendations")
+    except Exception as e:
+        print(f"\n❌ Test failed: {str(e)}")
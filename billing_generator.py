@@ -3,64 +3,198 @@ Synthetic Billing Data Generation using LLM
 Generates realistic, budget-aware cloud billing records
 """
 import json
+import logging
 import random
-from profile_extractor import call_llm
-from utils import extract_json_from_text
+import re
+from llm_cache import cached_call_llm, cached_call_llm_async
+from profile_extractor import call_llm_stream, GROQ_MAX_COMPLETION_TOKENS
+from utils import extract_json_from_text, ChunkReader, aggregate_billing_costs, can_vectorize_aggregation
 
-def generate_mock_billing(profile):
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Lazy %-style logging keeps per-record reporting free when disabled —
+# batch runs can silence it by raising the level instead of paying
+# stdout writes per profile
+log = logging.getLogger(__name__)
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson parses/serializes in native code, several times faster than stdlib
+# json on the multi-KB LLM responses; fall back to stdlib when unavailable.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so except clauses
+# work unchanged.
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps_indent(obj):
+        # Sorted keys keep prompt bytes canonical, so structurally
+        # identical profiles hit the same LLM-response cache entry
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode()
+else:
+    _json_loads = json.loads
+
+    def _json_dumps_indent(obj):
+        return json.dumps(obj, indent=2, sort_keys=True)
+
+# Cheap sanity check that a response can even be JSON before handing it
+# to the parser — on prose/truncated responses this skips a full O(N)
+# parser scan and goes straight to the extraction fallback
+_JSON_START = re.compile(r'\s*[\[{]')
+
+# Fields every billing record must carry
+REQUIRED_BILLING_FIELDS = ['month', 'service', 'resource_id', 'region',
+                           'usage_type', 'usage_quantity', 'unit', 'cost_inr', 'desc']
+
+# Hosting keyword → provider, with a compiled alternation for substring
+# matches (e.g. "aws ec2"); exact matches resolve with one dict lookup
+_HOSTING_MAP = {
+    'aws': 'AWS',
+    'amazon': 'AWS',
+    'azure': 'Azure',
+    'microsoft': 'Azure',
+    'gcp': 'GCP',
+    'google': 'GCP'
+}
+_HOSTING_RE = re.compile('|'.join(_HOSTING_MAP))
+
+def _detect_provider(profile):
     """
-    Generate realistic synthetic billing data based on project profile
-    
+    Determine the primary cloud provider from the tech stack
+
     Args:
         profile: Project profile dictionary
-    
+
     Returns:
-        list: Array of 12-20 billing records
+        str: 'AWS', 'Azure' or 'GCP'
     """
-    tech_stack_str = json.dumps(profile['tech_stack'], indent=2)
-    budget = profile['budget_inr_per_month']
-    
-    # Determine cloud provider from tech stack
     hosting = profile['tech_stack'].get('hosting', 'aws')
-    if hosting and isinstance(hosting, str):
-        hosting = hosting.lower()
-        if 'aws' in hosting or hosting == 'amazon':
-            provider = 'AWS'
-        elif 'azure' in hosting or 'microsoft' in hosting:
-            provider = 'Azure'
-        elif 'gcp' in hosting or 'google' in hosting:
-            provider = 'GCP'
-        else:
-            provider = 'AWS'  # Default
-    else:
-        provider = 'AWS'
-    
-    prompt = f"""You are a cloud billing expert. Generate realistic monthly billing records for this project.
+    if not hosting or not isinstance(hosting, str):
+        return 'AWS'
 
-Project Details:
-- Name: {profile['name']}
-- Monthly Budget: ₹{budget}
-- Primary Cloud Provider: {provider}
-- Tech Stack:
-{tech_stack_str}
+    hosting = hosting.lower()
+    provider = _HOSTING_MAP.get(hosting)
+    if provider is None:
+        match = _HOSTING_RE.search(hosting)
+        provider = _HOSTING_MAP[match.group(0)] if match else 'AWS'  # Default
+
+    return provider
+
+# Provider-specific service taxonomy and example names. One specialized
+# prompt prefix is built per provider at import time: single-provider
+# prompts are ~30% smaller than a multi-provider one, and each stays
+# byte-identical across calls for prompt caching.
+_PROVIDER_SERVICES = {
+    'AWS': {
+        'compute': 'EC2 (for web servers, API servers, workers)',
+        'database': 'RDS, DynamoDB, managed MongoDB',
+        'storage': 'S3 (for files, backups, static assets)',
+        'networking': 'ELB Load Balancers, CloudFront CDN, VPC, Data Transfer',
+        'monitoring': 'CloudWatch',
+        'other': 'Lambda, SES, Route53, WAF, AWS Backup',
+        'region_hint': 'e.g. "ap-south-1" for Mumbai, "us-east-1"',
+        'examples': [
+            ('EC2', 'i-web-server-01', 'ap-south-1', 't3.medium Linux/UNIX',
+             720, 'hours', 1200, 'Primary web server hosting React frontend'),
+            ('RDS', 'db-mongodb-prod', 'ap-south-1', 'db.t3.small MongoDB',
+             720, 'hours', 900, 'Production MongoDB database'),
+            ('S3', 'bucket-static-assets', 'ap-south-1', 'Standard Storage',
+             50, 'GB-month', 150, 'Static files and user uploads'),
+        ],
+    },
+    'Azure': {
+        'compute': 'Virtual Machines (for web servers, API servers, workers)',
+        'database': 'Azure SQL, Cosmos DB, managed MongoDB',
+        'storage': 'Blob Storage (for files, backups, static assets)',
+        'networking': 'Load Balancer, Azure CDN, Virtual Network, Bandwidth',
+        'monitoring': 'Azure Monitor',
+        'other': 'Functions, Communication Services, Azure DNS, WAF, Azure Backup',
+        'region_hint': 'e.g. "centralindia", "westus2"',
+        'examples': [
+            ('Virtual Machines', 'vm-web-server-01', 'centralindia', 'B2s Linux',
+             720, 'hours', 1200, 'Primary web server hosting React frontend'),
+            ('Cosmos DB', 'db-mongodb-prod', 'centralindia', 'MongoDB API 400 RU/s',
+             720, 'hours', 900, 'Production MongoDB database'),
+            ('Blob Storage', 'blob-static-assets', 'centralindia', 'Hot LRS',
+             50, 'GB-month', 150, 'Static files and user uploads'),
+        ],
+    },
+    'GCP': {
+        'compute': 'Compute Engine (for web servers, API servers, workers)',
+        'database': 'Cloud SQL, Firestore, managed MongoDB',
+        'storage': 'Cloud Storage (for files, backups, static assets)',
+        'networking': 'Cloud Load Balancing, Cloud CDN, VPC, Network Egress',
+        'monitoring': 'Cloud Monitoring (Stackdriver)',
+        'other': 'Cloud Functions, Cloud DNS, Cloud Armor, Backup and DR',
+        'region_hint': 'e.g. "asia-south1" for Mumbai, "us-central1"',
+        'examples': [
+            ('Compute Engine', 'vm-web-server-01', 'asia-south1', 'e2-medium',
+             720, 'hours', 1200, 'Primary web server hosting React frontend'),
+            ('Cloud SQL', 'db-mongodb-prod', 'asia-south1', 'db-f1-micro MongoDB',
+             720, 'hours', 900, 'Production MongoDB database'),
+            ('Cloud Storage', 'bucket-static-assets', 'asia-south1', 'Standard Storage',
+             50, 'GB-month', 150, 'Static files and user uploads'),
+        ],
+    },
+}
+
+def _build_prompt_prefix(provider):
+    """
+    Build the static billing-prompt prefix specialized for one provider
+
+    Args:
+        provider: Primary cloud provider name
+
+    Returns:
+        str: Static prompt prefix text
+    """
+    services = _PROVIDER_SERVICES[provider]
+
+    example_records = ',\n'.join(
+        f"""  {{
+    "month": "2025-01",
+    "service": "{service}",
+    "resource_id": "{resource_id}",
+    "region": "{region}",
+    "usage_type": "{usage_type}",
+    "usage_quantity": {quantity},
+    "unit": "{unit}",
+    "cost_inr": {cost},
+    "desc": "{desc}"
+  }}"""
+        for service, resource_id, region, usage_type, quantity, unit, cost, desc
+        in services['examples']
+    )
+
+    return f"""You are a cloud billing expert. Generate realistic monthly {provider} billing records for the project described after these instructions.
 
 Your task: Generate 12-20 billing records that represent one month of cloud usage.
 
 Requirements:
-1. Total cost should be between {budget * 0.9} and {budget * 1.3} INR (can slightly exceed budget)
+1. Total cost should fall in the budget range given in the project details (can slightly exceed budget)
 2. Include diverse cloud services based on tech stack:
-   - COMPUTE: EC2/Virtual Machines (for web servers, API servers, workers)
-   - DATABASE: RDS, MongoDB, managed databases
-   - STORAGE: S3, Blob Storage, Cloud Storage (for files, backups, static assets)
-   - NETWORKING: Load Balancers, CloudFront/CDN, VPC, Data Transfer
-   - MONITORING: CloudWatch, Azure Monitor, Stackdriver
-   - OTHER: Lambda/Functions, SES/Email, Route53/DNS, WAF, Backup services
+   - COMPUTE: {services['compute']}
+   - DATABASE: {services['database']}
+   - STORAGE: {services['storage']}
+   - NETWORKING: {services['networking']}
+   - MONITORING: {services['monitoring']}
+   - OTHER: {services['other']}
 
 3. Each record MUST have these exact fields:
    - month: "2025-01" (current month)
-   - service: Service name (EC2, RDS, S3, etc.)
+   - service: Service name
    - resource_id: Unique identifier (e.g., "i-web-server-01", "db-mongo-prod")
-   - region: Cloud region (e.g., "ap-south-1" for Mumbai, "us-east-1", "westus2")
+   - region: Cloud region ({services['region_hint']})
    - usage_type: Instance type or usage category
    - usage_quantity: Number (hours for compute, GB for storage, requests for functions)
    - unit: "hours", "GB", "requests", "GB-month", etc.
@@ -84,141 +218,542 @@ Requirements:
 
 Example format:
 [
-  {{
-    "month": "2025-01",
-    "service": "EC2",
-    "resource_id": "i-web-server-01",
-    "region": "ap-south-1",
-    "usage_type": "t3.medium Linux/UNIX",
-    "usage_quantity": 720,
-    "unit": "hours",
-    "cost_inr": 1200,
-    "desc": "Primary web server hosting React frontend"
-  }},
-  {{
-    "month": "2025-01",
-    "service": "RDS",
-    "resource_id": "db-mongodb-prod",
-    "region": "ap-south-1",
-    "usage_type": "db.t3.small MongoDB",
-    "usage_quantity": 720,
-    "unit": "hours",
-    "cost_inr": 900,
-    "desc": "Production MongoDB database"
-  }},
-  {{
-    "month": "2025-01",
-    "service": "S3",
-    "resource_id": "bucket-static-assets",
-    "region": "ap-south-1",
-    "usage_type": "Standard Storage",
-    "usage_quantity": 50,
-    "unit": "GB-month",
-    "cost_inr": 150,
-    "desc": "Static files and user uploads"
-  }}
+{example_records}
 ]
 
 CRITICAL: Return ONLY a valid JSON array. No explanations, no markdown, no extra text.
+"""
+
+# Specialized once at import, keyed by provider
+_BILLING_PROMPT_PREFIXES = {
+    provider: _build_prompt_prefix(provider) for provider in _PROVIDER_SERVICES
+}
+
+# Variable suffix, interpolated with .format per call; the prefix above is
+# appended as-is so per-call string construction covers only these few lines
+_BILLING_PROMPT_SUFFIX = """
+Project Details:
+- Name: {name}
+- Monthly Budget: ₹{budget} (total cost between {budget_low} and {budget_high} INR)
+- Primary Cloud Provider: {provider}
+- Tech Stack:
+{tech_stack}
+
+JSON Array:"""
+
+def _build_billing_prompt(profile, provider):
+    """
+    Build the billing-generation prompt for a profile
+
+    The variable project details go after the static prefix so the
+    shared prefix stays byte-identical across invocations.
+
+    Args:
+        profile: Project profile dictionary
+        provider: Primary cloud provider name
+
+    Returns:
+        str: Full prompt text
+    """
+    budget = profile['budget_inr_per_month']
+
+    return _BILLING_PROMPT_PREFIXES[provider] + _BILLING_PROMPT_SUFFIX.format(
+        name=profile['name'],
+        budget=budget,
+        budget_low=budget * 0.9,
+        budget_high=budget * 1.3,
+        provider=provider,
+        tech_stack=_json_dumps_indent(profile['tech_stack'])
+    )
+
+# Fallback billing templates, one per provider: (service, resource_id,
+# usage_type, usage_quantity, unit, budget_weight, desc). Weights sum to
+# 1.0 so scaling by the monthly budget lands on a realistic total.
+_FALLBACK_TEMPLATES = {
+    'AWS': ('ap-south-1', [
+        ('EC2', 'i-web-server-01', 't3.medium Linux/UNIX', 720, 'hours', 0.25, 'Primary web server'),
+        ('EC2', 'i-api-server-01', 't3.small Linux/UNIX', 720, 'hours', 0.12, 'API server'),
+        ('RDS', 'db-prod-01', 'db.t3.small', 720, 'hours', 0.18, 'Production database'),
+        ('ElastiCache', 'cache-prod-01', 'cache.t3.micro', 720, 'hours', 0.07, 'Application cache'),
+        ('S3', 'bucket-static-assets', 'Standard Storage', 50, 'GB-month', 0.08, 'Static files and uploads'),
+        ('S3', 'bucket-backups', 'Standard-IA Storage', 100, 'GB-month', 0.04, 'Nightly backups'),
+        ('ELB', 'lb-prod-01', 'Application Load Balancer', 720, 'hours', 0.06, 'Load balancer'),
+        ('CloudFront', 'cdn-prod-01', 'Data Transfer Out', 80, 'GB', 0.05, 'CDN for static assets'),
+        ('VPC', 'vpc-prod-01', 'Data Transfer', 60, 'GB', 0.03, 'Inter-AZ data transfer'),
+        ('CloudWatch', 'monitor-prod-01', 'Metrics + Logs', 30, 'GB', 0.04, 'Monitoring and alerting'),
+        ('Lambda', 'fn-workers-01', 'Requests', 500000, 'requests', 0.03, 'Background jobs'),
+        ('Route53', 'dns-prod-01', 'Hosted Zone', 1, 'zone-month', 0.01, 'DNS hosting'),
+        ('Backup', 'backup-prod-01', 'Backup Storage', 80, 'GB-month', 0.04, 'Managed backups'),
+    ]),
+    'Azure': ('centralindia', [
+        ('Virtual Machines', 'vm-web-server-01', 'B2s Linux', 720, 'hours', 0.25, 'Primary web server'),
+        ('Virtual Machines', 'vm-api-server-01', 'B1s Linux', 720, 'hours', 0.12, 'API server'),
+        ('Azure SQL', 'db-prod-01', 'Basic tier', 720, 'hours', 0.18, 'Production database'),
+        ('Azure Cache', 'cache-prod-01', 'Basic C0', 720, 'hours', 0.07, 'Application cache'),
+        ('Blob Storage', 'blob-static-assets', 'Hot LRS', 50, 'GB-month', 0.08, 'Static files and uploads'),
+        ('Blob Storage', 'blob-backups', 'Cool LRS', 100, 'GB-month', 0.04, 'Nightly backups'),
+        ('Load Balancer', 'lb-prod-01', 'Standard', 720, 'hours', 0.06, 'Load balancer'),
+        ('Azure CDN', 'cdn-prod-01', 'Standard Microsoft', 80, 'GB', 0.05, 'CDN for static assets'),
+        ('Bandwidth', 'net-prod-01', 'Data Transfer Out', 60, 'GB', 0.03, 'Outbound data transfer'),
+        ('Azure Monitor', 'monitor-prod-01', 'Metrics + Logs', 30, 'GB', 0.04, 'Monitoring and alerting'),
+        ('Functions', 'fn-workers-01', 'Consumption', 500000, 'requests', 0.03, 'Background jobs'),
+        ('Azure DNS', 'dns-prod-01', 'Hosted Zone', 1, 'zone-month', 0.01, 'DNS hosting'),
+        ('Azure Backup', 'backup-prod-01', 'Backup Storage', 80, 'GB-month', 0.04, 'Managed backups'),
+    ]),
+    'GCP': ('asia-south1', [
+        ('Compute Engine', 'vm-web-server-01', 'e2-medium', 720, 'hours', 0.25, 'Primary web server'),
+        ('Compute Engine', 'vm-api-server-01', 'e2-small', 720, 'hours', 0.12, 'API server'),
+        ('Cloud SQL', 'db-prod-01', 'db-f1-micro', 720, 'hours', 0.18, 'Production database'),
+        ('Memorystore', 'cache-prod-01', 'Basic M1', 720, 'hours', 0.07, 'Application cache'),
+        ('Cloud Storage', 'bucket-static-assets', 'Standard Storage', 50, 'GB-month', 0.08, 'Static files and uploads'),
+        ('Cloud Storage', 'bucket-backups', 'Nearline Storage', 100, 'GB-month', 0.04, 'Nightly backups'),
+        ('Cloud Load Balancing', 'lb-prod-01', 'Forwarding Rules', 720, 'hours', 0.06, 'Load balancer'),
+        ('Cloud CDN', 'cdn-prod-01', 'Cache Egress', 80, 'GB', 0.05, 'CDN for static assets'),
+        ('Network Egress', 'net-prod-01', 'Data Transfer Out', 60, 'GB', 0.03, 'Outbound data transfer'),
+        ('Cloud Monitoring', 'monitor-prod-01', 'Metrics + Logs', 30, 'GB', 0.04, 'Monitoring and alerting'),
+        ('Cloud Functions', 'fn-workers-01', 'Invocations', 500000, 'requests', 0.03, 'Background jobs'),
+        ('Cloud DNS', 'dns-prod-01', 'Managed Zone', 1, 'zone-month', 0.01, 'DNS hosting'),
+        ('Backup and DR', 'backup-prod-01', 'Backup Storage', 80, 'GB-month', 0.04, 'Managed backups'),
+    ]),
+}
+
+def fallback_billing(provider, profile):
+    """
+    Deterministic billing records for when the LLM path fails
+
+    Scales the fixed per-provider service template to the project
+    budget, so failed profiles still get a realistic record set without
+    a second LLM round-trip — and regression tests get reproducible
+    totals.
+
+    Args:
+        provider: Primary cloud provider name
+        profile: Project profile dictionary
+
+    Returns:
+        list: Array of billing records
+    """
+    budget = profile['budget_inr_per_month']
+    region, template = _FALLBACK_TEMPLATES[provider]
+
+    return [
+        {
+            'month': '2025-01',
+            'service': service,
+            'resource_id': resource_id,
+            'region': region,
+            'usage_type': usage_type,
+            'usage_quantity': usage_quantity,
+            'unit': unit,
+            'cost_inr': round(budget * weight, 2),
+            'desc': desc
+        }
+        for service, resource_id, usage_type, usage_quantity, unit, weight, desc in template
+    ]
+
+def generate_mock_billing(profile):
+    """
+    Generate realistic synthetic billing data based on project profile
+
+    Falls back to the deterministic template when the LLM call or its
+    response validation fails.
+
+    Args:
+        profile: Project profile dictionary
+
+    Returns:
+        list: Array of 12-20 billing records
+    """
+    provider = _detect_provider(profile)
+    prompt = _build_billing_prompt(profile, provider)
+
+    log.info("  → Generating billing data for %s...", provider)
+    try:
+        response = cached_call_llm(prompt, max_tokens=3500)
+        return _parse_billing_response(response, profile['budget_inr_per_month'])
+    except Exception as e:
+        log.warning("  ⚠️ LLM billing generation failed (%s); using deterministic fallback", e)
+        return fallback_billing(provider, profile)
+
+async def generate_mock_billing_async(profile):
+    """
+    Async variant of generate_mock_billing for concurrent pipelines
+
+    Args:
+        profile: Project profile dictionary
+
+    Returns:
+        list: Array of 12-20 billing records
+    """
+    provider = _detect_provider(profile)
+    prompt = _build_billing_prompt(profile, provider)
+
+    log.info("  → Generating billing data for %s...", provider)
+    try:
+        response = await cached_call_llm_async(prompt, max_tokens=3500)
+        return _parse_billing_response(response, profile['budget_inr_per_month'])
+    except Exception as e:
+        log.warning("  ⚠️ LLM billing generation failed (%s); using deterministic fallback", e)
+        return fallback_billing(provider, profile)
+
+def generate_mock_billing_streaming(profile):
+    """
+    Streaming variant: parse billing records while the model decodes
+
+    Records are parsed as they arrive, so the validated record list is
+    ready the instant the response's JSON array closes — letting the
+    cost-analysis request start immediately instead of after a buffered
+    parse of the full response. Falls back to the buffered path when
+    ijson is not installed or the stream is not clean JSON.
+
+    Args:
+        profile: Project profile dictionary
+
+    Returns:
+        list: Array of 12-20 billing records
+    """
+    if ijson is None:
+        return generate_mock_billing(profile)
+
+    provider = _detect_provider(profile)
+    prompt = _build_billing_prompt(profile, provider)
+
+    log.info("  → Generating billing data for %s (streaming)...", provider)
+
+    collected = []
+
+    def _tee(chunks):
+        for chunk in chunks:
+            collected.append(chunk)
+            yield chunk
+
+    chunks = _tee(call_llm_stream(prompt, max_tokens=3500))
+
+    try:
+        records = list(ijson.items(ChunkReader(chunks), 'item', use_float=True))
+    except ijson.JSONError:
+        # Stream was not bare JSON (markdown fences, prose); drain it and
+        # hand the full text to the buffered parser, falling back to the
+        # deterministic records if that fails too — same as the buffered
+        # and async variants
+        for _ in chunks:
+            pass
+        try:
+            return _parse_billing_response(''.join(collected), profile['budget_inr_per_month'])
+        except Exception as e:
+            log.warning("  ⚠️ LLM billing generation failed (%s); using deterministic fallback", e)
+            return fallback_billing(provider, profile)
+    except Exception as e:
+        log.warning("  ⚠️ LLM billing generation failed (%s); using deterministic fallback", e)
+        return fallback_billing(provider, profile)
+
+    try:
+        return _validate_billing_records(records, profile['budget_inr_per_month'])
+    except ValueError as e:
+        log.warning("  ⚠️ Billing validation failed (%s); using deterministic fallback", e)
+        return fallback_billing(provider, profile)
+
+def generate_mock_billing_batch(profiles):
+    """
+    Generate billing data for several profiles with a single LLM call
+
+    The static instructions (service taxonomy, format rules, example)
+    are identical for every profile, so batching amortizes that prompt
+    overhead across the whole batch instead of paying it per profile.
+
+    Args:
+        profiles: List of project profile dictionaries
+
+    Returns:
+        list: One list of validated billing records per profile
+    """
+    if not profiles:
+        return []
+
+    project_sections = []
+    for idx, profile in enumerate(profiles, 1):
+        provider = _detect_provider(profile)
+        tech_stack_str = _json_dumps_indent(profile['tech_stack'])
+        budget = profile['budget_inr_per_month']
+        project_sections.append(f"""Project {idx}:
+- Name: {profile['name']}
+- Monthly Budget: ₹{budget} (total cost between {budget * 0.9} and {budget * 1.3} INR)
+- Primary Cloud Provider: {provider}
+- Tech Stack:
+{tech_stack_str}""")
+
+    projects_str = "\n\n".join(project_sections)
+
+    prompt = f"""You are a cloud billing expert. Generate realistic monthly billing records for {len(profiles)} projects at once.
+
+{projects_str}
+
+Your task: For EACH project, generate 12-20 billing records that represent one month of cloud usage.
+
+Requirements for every project:
+1. Total cost should stay within the budget range listed for that project
+2. Include diverse cloud services based on its tech stack:
+   - COMPUTE: EC2/Virtual Machines (for web servers, API servers, workers)
+   - DATABASE: RDS, MongoDB, managed databases
+   - STORAGE: S3, Blob Storage, Cloud Storage (for files, backups, static assets)
+   - NETWORKING: Load Balancers, CloudFront/CDN, VPC, Data Transfer
+   - MONITORING: CloudWatch, Azure Monitor, Stackdriver
+   - OTHER: Lambda/Functions, SES/Email, Route53/DNS, WAF, Backup services
+
+3. Each record MUST have these exact fields:
+   - month: "2025-01" (current month)
+   - service: Service name (EC2, RDS, S3, etc.)
+   - resource_id: Unique identifier (e.g., "i-web-server-01", "db-mongo-prod")
+   - region: Cloud region (e.g., "ap-south-1" for Mumbai, "us-east-1", "westus2")
+   - usage_type: Instance type or usage category
+   - usage_quantity: Number (hours for compute, GB for storage, requests for functions)
+   - unit: "hours", "GB", "requests", "GB-month", etc.
+   - cost_inr: Cost in Indian Rupees (numeric)
+   - desc: Brief description of what this resource does
+
+4. Make it realistic: servers run 24/7 (720 hours/month), databases run
+   continuously, include load balancer, CDN, monitoring and backup services.
+
+OUTPUT FORMAT: Return ONLY a JSON array with {len(profiles)} elements, one per
+project IN THE SAME ORDER as listed above. Each element is that project's
+array of billing records:
+[
+  [ {{"month": "2025-01", "service": "EC2", ...}}, ... ],
+  [ {{"month": "2025-01", "service": "EC2", ...}}, ... ]
+]
+
+CRITICAL: Return ONLY the valid JSON array-of-arrays. No explanations, no markdown, no extra text.
 
 JSON Array:"""
 
-    print(f"  → Generating billing data for {provider}...")
-    response = call_llm(prompt, max_tokens=3500)
+    log.info("  → Generating billing data for %d profiles in one call...", len(profiles))
+    response = cached_call_llm(
+        prompt, max_tokens=min(3500 * len(profiles), GROQ_MAX_COMPLETION_TOKENS)
+    )
+
+    # Fast path: the prompt demands bare JSON, so most responses parse directly
+    try:
+        if not _JSON_START.match(response):
+            raise json.JSONDecodeError("response does not start with JSON", response, 0)
+        all_records = _json_loads(response.strip())
+    except json.JSONDecodeError:
+        json_text = extract_json_from_text(response)
+        try:
+            all_records = _json_loads(json_text)
+        except json.JSONDecodeError as e:
+            log.error("\n❌ Failed to parse batched billing data as JSON")
+            log.error("Error: %s", e)
+            log.error("\nLLM Response (first 500 chars):\n%s", response[:500])
+            raise ValueError(f"Failed to parse batched billing data as JSON: {str(e)}")
+
+    if not isinstance(all_records, list) or len(all_records) != len(profiles):
+        raise ValueError(
+            f"Expected {len(profiles)} record sets, got "
+            f"{len(all_records) if isinstance(all_records, list) else type(all_records).__name__}"
+        )
+
+    results = []
+    for profile, records in zip(profiles, all_records):
+        log.info("\n  Project: %s", profile['name'])
+        results.append(_validate_billing_records(records, profile['budget_inr_per_month']))
+
+    return results
+
+def _parse_billing_response(response, budget):
+    """
+    Parse and validate the LLM billing response
+
+    Args:
+        response: Raw LLM response text
+        budget: Monthly budget in INR (for the budget report)
+
+    Returns:
+        list: Validated billing records
+    """
+    # Fast path: the prompt demands bare JSON, so most responses parse directly
+    json_text = response.strip()
+    try:
+        if not _JSON_START.match(json_text):
+            raise json.JSONDecodeError("response does not start with JSON", json_text, 0)
+        billing_records = _json_loads(json_text)
+    except json.JSONDecodeError:
+        # Fall back to extracting JSON from surrounding markdown/prose
+        json_text = extract_json_from_text(response)
+        try:
+            billing_records = _json_loads(json_text)
+        except json.JSONDecodeError as e:
+            log.error("\n❌ Failed to parse billing data as JSON")
+            log.error("Error: %s", e)
+            log.error("\nLLM Response (first 500 chars):\n%s", response[:500])
+            log.error("\nExtracted JSON text (first 500 chars):\n%s", json_text[:500])
+            raise ValueError(f"Failed to parse billing data as JSON: {str(e)}")
+
+    try:
+        return _validate_billing_records(billing_records, budget)
+    except Exception as e:
+        log.error("\n❌ Error processing billing data")
+        log.error("Error: %s", e)
+        raise ValueError(f"Error processing billing data: {str(e)}")
+
+
+def _validate_billing_records(billing_records, budget):
+    """
+    Validate parsed billing records and report the cost breakdown
+
+    Args:
+        billing_records: Parsed JSON array of billing records
+        budget: Monthly budget in INR (for the budget report)
+
+    Returns:
+        list: Validated billing records
+    """
+    # Validate it's an array
+    if not isinstance(billing_records, list):
+        raise ValueError("Response is not a JSON array")
+    
+    # Check minimum records
+    if len(billing_records) < 12:
+        log.warning("  ⚠️ Only generated %d records, need at least 12", len(billing_records))
+        raise ValueError(f"Generated only {len(billing_records)} records, need at least 12")
+    
+    if len(billing_records) > 20:
+        log.warning("  ⚠️ Generated %d records, trimming to 20", len(billing_records))
+        billing_records = billing_records[:20]
+    
+    # Validate each record (vectorized when pandas is available)
+    if pd is not None:
+        valid_records = _validate_records_vectorized(billing_records)
+    else:
+        valid_records = _validate_records_loop(billing_records)
+
+    if len(valid_records) < 12:
+        raise ValueError(f"Only {len(valid_records)} valid records after validation")
     
-    # Extract JSON from response
-    json_text = extract_json_from_text(response)
+    # Calculate total cost
+    total_cost = sum(r['cost_inr'] for r in valid_records)
     
-    try:
-        billing_records = json.loads(json_text)
-        
-        # Validate it's an array
-        if not isinstance(billing_records, list):
-            raise ValueError("Response is not a JSON array")
-        
-        # Check minimum records
-        if len(billing_records) < 12:
-            print(f"  ⚠️ Only generated {len(billing_records)} records, need at least 12")
-            raise ValueError(f"Generated only {len(billing_records)} records, need at least 12")
-        
-        if len(billing_records) > 20:
-            print(f"  ⚠️ Generated {len(billing_records)} records, trimming to 20")
-            billing_records = billing_records[:20]
-        
-        # Validate each record
-        required_fields = ['month', 'service', 'resource_id', 'region', 
-                          'usage_type', 'usage_quantity', 'unit', 'cost_inr', 'desc']
-        
-        valid_records = []
-        for idx, record in enumerate(billing_records):
-            try:
-                # Check all required fields exist
-                for field in required_fields:
-                    if field not in record:
-                        raise ValueError(f"Record {idx} missing field: {field}")
-                
-                # Ensure cost is numeric and positive
-                if not isinstance(record['cost_inr'], (int, float)):
-                    try:
-                        record['cost_inr'] = float(str(record['cost_inr']).replace(',', ''))
-                    except:
-                        raise ValueError(f"Record {idx} has invalid cost: {record['cost_inr']}")
-                
-                if record['cost_inr'] < 0:
-                    raise ValueError(f"Record {idx} has negative cost")
-                
-                # Ensure usage_quantity is numeric
-                if not isinstance(record['usage_quantity'], (int, float)):
-                    try:
-                        record['usage_quantity'] = float(str(record['usage_quantity']).replace(',', ''))
-                    except:
-                        raise ValueError(f"Record {idx} has invalid usage_quantity")
-                
-                valid_records.append(record)
-                
-            except ValueError as e:
-                print(f"  ⚠️ Skipping invalid record {idx}: {str(e)}")
-                continue
-        
-        if len(valid_records) < 12:
-            raise ValueError(f"Only {len(valid_records)} valid records after validation")
-        
-        # Calculate total cost
-        total_cost = sum(r['cost_inr'] for r in valid_records)
-        
-        print(f"  ✓ Generated {len(valid_records)} billing records")
-        print(f"  ✓ Total monthly cost: ₹{total_cost:,.2f}")
-        print(f"  ✓ Budget: ₹{budget:,.2f}")
-        
-        if total_cost > budget:
-            print(f"  ⚠️ Over budget by ₹{total_cost - budget:,.2f}")
-        else:
-            print(f"  ✓ Under budget by ₹{budget - total_cost:,.2f}")
-        
-        # Show service breakdown
+    log.info("  ✓ Generated %d billing records", len(valid_records))
+    log.info("  ✓ Total monthly cost: ₹%s", f"{total_cost:,.2f}")
+    log.info("  ✓ Budget: ₹%s", f"{budget:,.2f}")
+
+    if total_cost > budget:
+        log.warning("  ⚠️ Over budget by ₹%s", f"{total_cost - budget:,.2f}")
+    else:
+        log.info("  ✓ Under budget by ₹%s", f"{budget - total_cost:,.2f}")
+
+    # Show service breakdown (skip the grouping/sort entirely when silenced)
+    if log.isEnabledFor(logging.INFO):
         service_costs = {}
         for record in valid_records:
             service = record['service']
             service_costs[service] = service_costs.get(service, 0) + record['cost_inr']
-        
-        print(f"\n  Service Breakdown:")
+
+        log.info("\n  Service Breakdown:")
         for service, cost in sorted(service_costs.items(), key=lambda x: x[1], reverse=True):
             percentage = (cost / total_cost * 100) if total_cost > 0 else 0
-            print(f"    - {service}: ₹{cost:,.2f} ({percentage:.1f}%)")
-        
-        return valid_records
-        
-    except json.JSONDecodeError as e:
-        print(f"\n❌ Failed to parse billing data as JSON")
-        print(f"Error: {str(e)}")
-        print(f"\nLLM Response (first 500 chars):\n{response[:500]}")
-        print(f"\nExtracted JSON text (first 500 chars):\n{json_text[:500]}")
-        raise ValueError(f"Failed to parse billing data as JSON: {str(e)}")
-        
-    except Exception as e:
-        print(f"\n❌ Error processing billing data")
-        print(f"Error: {str(e)}")
-        raise ValueError(f"Error processing billing data: {str(e)}")
+            log.info("    - %s: ₹%s (%.1f%%)", service, f"{cost:,.2f}", percentage)
+    
+    return valid_records
+
+def _validate_records_vectorized(billing_records):
+    """
+    Validate and coerce billing records in a single pandas pass
+
+    Column-wise masks and pd.to_numeric replace the per-record Python
+    loop, so validation runs in C — the difference matters when batch
+    pipelines validate thousands of records per run.
+
+    Args:
+        billing_records: Parsed JSON array of billing records
+
+    Returns:
+        list: Validated billing records
+    """
+    df = pd.DataFrame(billing_records)
+
+    # Missing columns become all-NaN so the numeric masks reject them
+    for field in ('cost_inr', 'usage_quantity'):
+        if field not in df.columns:
+            df[field] = None
+
+    # Coerce cost and quantity to numeric (handles "1,200"-style strings)
+    costs = pd.to_numeric(
+        df['cost_inr'].astype(str).str.replace(',', '', regex=False),
+        errors='coerce'
+    )
+    quantities = pd.to_numeric(
+        df['usage_quantity'].astype(str).str.replace(',', '', regex=False),
+        errors='coerce'
+    )
+
+    # Field *presence* is checked on the records themselves — like the
+    # loop path, an explicitly null desc/region is present and valid,
+    # which a DataFrame NaN check could not distinguish from a missing key
+    present = pd.Series(
+        [all(field in record for field in REQUIRED_BILLING_FIELDS)
+         for record in billing_records],
+        index=df.index
+    )
+
+    valid_mask = present & costs.notna() & (costs >= 0) & quantities.notna()
+
+    cost_values = costs.tolist()
+    quantity_values = quantities.tolist()
+
+    valid_records = []
+    for idx in df.index[valid_mask]:
+        record = billing_records[idx]
+        record['cost_inr'] = cost_values[idx]
+        record['usage_quantity'] = quantity_values[idx]
+        valid_records.append(record)
+
+    for idx in df.index[~valid_mask]:
+        log.warning("  ⚠️ Skipping invalid record %d", idx)
+
+    return valid_records
+
+def _validate_records_loop(billing_records):
+    """
+    Validate and coerce billing records one at a time (pandas fallback)
+
+    Args:
+        billing_records: Parsed JSON array of billing records
+
+    Returns:
+        list: Validated billing records
+    """
+    valid_records = []
+    for idx, record in enumerate(billing_records):
+        try:
+            # Check all required fields exist
+            for field in REQUIRED_BILLING_FIELDS:
+                if field not in record:
+                    raise ValueError(f"Record {idx} missing field: {field}")
+
+            # Ensure cost is numeric and positive
+            if not isinstance(record['cost_inr'], (int, float)):
+                try:
+                    record['cost_inr'] = float(str(record['cost_inr']).replace(',', ''))
+                except:
+                    raise ValueError(f"Record {idx} has invalid cost: {record['cost_inr']}")
+
+            if record['cost_inr'] < 0:
+                raise ValueError(f"Record {idx} has negative cost")
+
+            # Ensure usage_quantity is numeric
+            if not isinstance(record['usage_quantity'], (int, float)):
+                try:
+                    record['usage_quantity'] = float(str(record['usage_quantity']).replace(',', ''))
+                except:
+                    raise ValueError(f"Record {idx} has invalid usage_quantity")
+
+            valid_records.append(record)
+
+        except ValueError as e:
+            log.warning("  ⚠️ Skipping invalid record %d: %s", idx, e)
+            continue
+
+    return valid_records
 
 def validate_billing_record(record):
     """
@@ -267,20 +802,20 @@ def calculate_billing_summary(billing_records):
     Returns:
         dict: Summary statistics
     """
-    total_cost = sum(r['cost_inr'] for r in billing_records)
-    
-    # Group by service
-    service_costs = {}
-    for record in billing_records:
-        service = record['service']
-        service_costs[service] = service_costs.get(service, 0) + record['cost_inr']
-    
-    # Group by region
-    region_costs = {}
-    for record in billing_records:
-        region = record['region']
-        region_costs[region] = region_costs.get(region, 0) + record['cost_inr']
-    
+    if can_vectorize_aggregation(len(billing_records)):
+        # Batch scale: aggregate with the compiled kernel
+        total_cost, service_costs, region_costs = aggregate_billing_costs(billing_records)
+    else:
+        # Accumulate total and both group-bys in a single pass over the records
+        total_cost = 0
+        service_costs = {}
+        region_costs = {}
+        for record in billing_records:
+            cost = record['cost_inr']
+            total_cost += cost
+            service_costs[record['service']] = service_costs.get(record['service'], 0) + cost
+            region_costs[record['region']] = region_costs.get(record['region'], 0) + cost
+
     return {
         'total_cost': total_cost,
         'record_count': len(billing_records),
@@ -292,6 +827,7 @@ def calculate_billing_summary(billing_records):
 
 if __name__ == "__main__":
     # Test the module
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("Testing Billing Generator...")
     
     test_profile = {
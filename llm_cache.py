@@ -0,0 +1,171 @@
+"""
+Deterministic LLM Response Cache
+Caches raw LLM responses so identical prompts skip the network call
+and token cost entirely (dev loops, repeated analyses, tests)
+"""
+import os
+import hashlib
+from collections import OrderedDict
+
+from profile_extractor import call_llm, call_llm_async, GROQ_MODEL
+
+try:
+    from diskcache import Cache
+except ImportError:
+    Cache = None
+
+# Directory for the persistent on-disk cache
+CACHE_DIR = os.getenv("LLM_CACHE_DIR", ".llm_cache")
+
+# In-memory LRU cache is always active; the disk backend persists across runs
+MEMORY_CACHE_SIZE = 128
+_memory_cache = OrderedDict()
+_disk_cache = None
+
+def _get_disk_cache():
+    """
+    Get the on-disk cache, constructing it on first use
+
+    Built lazily so merely importing the pipeline modules does not
+    create the cache directory in the working directory.
+
+    Returns:
+        Cache: diskcache backend, or None when diskcache is missing
+    """
+    global _disk_cache
+    if _disk_cache is None and Cache is not None:
+        _disk_cache = Cache(CACHE_DIR)
+    return _disk_cache
+
+def _memory_cache_put(key, response):
+    """Store a response in the in-memory LRU cache, evicting the oldest entry"""
+    _memory_cache[key] = response
+    _memory_cache.move_to_end(key)
+    while len(_memory_cache) > MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+
+def cache_enabled():
+    """
+    Check whether LLM response caching is enabled
+
+    Caching is safe here because calls use a low fixed temperature;
+    set LLM_CACHE_ENABLED=0 to force fresh responses.
+
+    Returns:
+        bool: True if caching is enabled
+    """
+    return os.getenv("LLM_CACHE_ENABLED", "1") != "0"
+
+def cache_key(prompt, max_tokens):
+    """
+    Compute the content-addressed cache key for a prompt
+
+    Args:
+        prompt: Full prompt text
+        max_tokens: Token limit passed to the LLM
+
+    Returns:
+        str: sha256 hex digest of model|max_tokens|prompt
+    """
+    raw = f"{GROQ_MODEL}|{max_tokens}|{prompt}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+def cached_call_llm(prompt, max_tokens=1000):
+    """
+    Call the LLM with a deterministic response cache in front
+
+    Checks the in-memory cache, then the on-disk cache, and only
+    falls through to the real LLM call on a miss.
+
+    Args:
+        prompt: Full prompt text
+        max_tokens: Token limit passed to the LLM
+
+    Returns:
+        str: Raw LLM response text
+    """
+    if not cache_enabled():
+        return call_llm(prompt, max_tokens=max_tokens)
+
+    key = cache_key(prompt, max_tokens)
+
+    if key in _memory_cache:
+        _memory_cache.move_to_end(key)
+        return _memory_cache[key]
+
+    disk_cache = _get_disk_cache()
+    if disk_cache is not None and key in disk_cache:
+        response = disk_cache[key]
+        _memory_cache_put(key, response)
+        return response
+
+    response = call_llm(prompt, max_tokens=max_tokens)
+
+    _memory_cache_put(key, response)
+    if disk_cache is not None:
+        disk_cache[key] = response
+
+    return response
+
+async def cached_call_llm_async(prompt, max_tokens=1000):
+    """
+    Async variant of cached_call_llm for concurrent pipelines
+
+    Cache lookups are fast local operations, so only the LLM
+    call itself is awaited.
+
+    Args:
+        prompt: Full prompt text
+        max_tokens: Token limit passed to the LLM
+
+    Returns:
+        str: Raw LLM response text
+    """
+    if not cache_enabled():
+        return await call_llm_async(prompt, max_tokens=max_tokens)
+
+    key = cache_key(prompt, max_tokens)
+
+    if key in _memory_cache:
+        _memory_cache.move_to_end(key)
+        return _memory_cache[key]
+
+    disk_cache = _get_disk_cache()
+    if disk_cache is not None and key in disk_cache:
+        response = disk_cache[key]
+        _memory_cache_put(key, response)
+        return response
+
+    response = await call_llm_async(prompt, max_tokens=max_tokens)
+
+    _memory_cache_put(key, response)
+    if disk_cache is not None:
+        disk_cache[key] = response
+
+    return response
+
+def clear_cache():
+    """Clear both the in-memory and on-disk caches"""
+    _memory_cache.clear()
+    disk_cache = _get_disk_cache()
+    if disk_cache is not None:
+        disk_cache.clear()
+
+if __name__ == "__main__":
+    # Test the module (no network needed)
+    print("Testing LLM Cache...")
+
+    key1 = cache_key("test prompt", 1000)
+    key2 = cache_key("test prompt", 1000)
+    key3 = cache_key("other prompt", 1000)
+
+    assert key1 == key2, "Same prompt should produce same key"
+    assert key1 != key3, "Different prompts should produce different keys"
+    print(f"  ✓ Cache keys deterministic: {key1[:16]}...")
+
+    _memory_cache[key1] = "cached response"
+    assert cached_call_llm("test prompt", 1000) == "cached response"
+    print("  ✓ Cache hit served without LLM call")
+
+    clear_cache()
+    print("\n✅ LLM cache tests complete!")
@@ -5,15 +5,27 @@ Extracts structured project profiles from free-form text descriptions
 """
 import os
 import json
-import requests
+import logging
+import re
 import time
-from groq import Groq
+import asyncio
 from dotenv import load_dotenv
 from utils import extract_json_from_text
 
+# Retry noise goes through logging: the warning line is cheap, and the
+# full traceback (a frame walk) is only rendered when DEBUG is on
+log = logging.getLogger(__name__)
+
 # Load environment variables
 load_dotenv()
 
+# Groq model used for all LLM calls
+GROQ_MODEL = "llama-3.1-8b-instant"
+
+# Completion ceiling for GROQ_MODEL; batched prompts that scale
+# max_tokens by batch size must stay under it or the request is rejected
+GROQ_MAX_COMPLETION_TOKENS = 8000
+
 # List of models to try (in order of preference)
 # AVAILABLE_MODELS = [
 #     "google/flan-t5-small",
@@ -21,21 +33,53 @@ load_dotenv()
 # ]
 
 
+# Lazily constructed client singletons: repeated calls reuse the SDK's
+# underlying HTTP connection pool instead of paying TCP/TLS setup (and
+# an environment lookup) on every invocation
+_CLIENT = None
+_ASYNC_CLIENT = None
+
+def _get_client():
+    """
+    Get the shared Groq client, constructing it on first use
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        # Imported lazily: the SDK (and its httpx/pydantic deps) loads
+        # only when an LLM call actually happens, keeping CLI startup fast
+        from groq import Groq
+
+        api_key = os.getenv("GROQ_API_KEY")
+        if not api_key:
+            raise ValueError("GROQ_API_KEY not found in environment variables")
+        _CLIENT = Groq(api_key=api_key)
+    return _CLIENT
+
+def _get_async_client():
+    """
+    Get the shared AsyncGroq client, constructing it on first use
+    """
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is None:
+        from groq import AsyncGroq
+
+        api_key = os.getenv("GROQ_API_KEY")
+        if not api_key:
+            raise ValueError("GROQ_API_KEY not found in environment variables")
+        _ASYNC_CLIENT = AsyncGroq(api_key=api_key)
+    return _ASYNC_CLIENT
+
 def call_llm(prompt, max_tokens=1000, retries=2):
     """
     Call Groq LLM with retry logic
     """
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise ValueError("GROQ_API_KEY not found in environment variables")
-
-    client = Groq(api_key=api_key)
+    client = _get_client()
 
     for attempt in range(retries):
         try:
             response = client.chat.completions.create(
                 # model="meta-llama/llama-4-scout-17b-16e-instruct",
-                model="llama-3.1-8b-instant" , 
+                model=GROQ_MODEL,
                 messages=[
                     {"role": "user", "content": prompt}
                 ],
@@ -46,11 +90,91 @@ def call_llm(prompt, max_tokens=1000, retries=2):
             return response.choices[0].message.content
 
         except Exception as e:
-            print(f"⚠️ Groq error (attempt {attempt + 1}/{retries}): {str(e)}")
+            log.warning("⚠️ Groq error (attempt %d/%d): %s", attempt + 1, retries, e)
+            log.debug("Groq call failed", exc_info=True)
+            if attempt == retries - 1:
+                raise
+            time.sleep(2)
+
+def call_llm_stream(prompt, max_tokens=1000, retries=2):
+    """
+    Streaming variant of call_llm, yielding response text chunks
+
+    Lets callers start parsing the response while the model is still
+    decoding, instead of waiting for the full completion.
+    """
+    client = _get_client()
+
+    for attempt in range(retries):
+        try:
+            stream = client.chat.completions.create(
+                model=GROQ_MODEL,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            break
+
+        except Exception as e:
+            log.warning("⚠️ Groq error (attempt %d/%d): %s", attempt + 1, retries, e)
+            log.debug("Groq call failed", exc_info=True)
             if attempt == retries - 1:
                 raise
             time.sleep(2)
 
+    for chunk in stream:
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
+
+async def call_llm_async(prompt, max_tokens=1000, retries=2):
+    """
+    Async variant of call_llm for concurrent pipelines
+
+    LLM latency is network-bound, so issuing several of these
+    concurrently via asyncio.gather gives near-linear speedup
+    up to provider rate limits.
+    """
+    client = _get_async_client()
+
+    for attempt in range(retries):
+        try:
+            response = await client.chat.completions.create(
+                model=GROQ_MODEL,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                max_tokens=max_tokens
+            )
+
+            return response.choices[0].message.content
+
+        except Exception as e:
+            log.warning("⚠️ Groq error (attempt %d/%d): %s", attempt + 1, retries, e)
+            log.debug("Groq call failed", exc_info=True)
+            if attempt == retries - 1:
+                raise
+            await asyncio.sleep(2)
+
+# JSON schema block shared by the single and batched extraction prompts
+_PROFILE_SCHEMA = """{
+  "name": "project name",
+  "budget_inr_per_month": 5000,
+  "description": "brief summary",
+  "tech_stack": {
+    "frontend": "react or null",
+    "backend": "nodejs or null",
+    "database": "mongodb or null",
+    "proxy": "nginx or null",
+    "hosting": "aws or null"
+  },
+  "non_functional_requirements": ["scalability", "availability"]
+}"""
+
 def extract_project_profile(description):
     """
     Extract structured project profile from free-form text using LLM
@@ -66,19 +190,7 @@ def extract_project_profile(description):
 Project Description: {description}
 
 Return this exact JSON structure:
-{{
-  "name": "project name",
-  "budget_inr_per_month": 5000,
-  "description": "brief summary",
-  "tech_stack": {{
-    "frontend": "react or null",
-    "backend": "nodejs or null",
-    "database": "mongodb or null",
-    "proxy": "nginx or null",
-    "hosting": "aws or null"
-  }},
-  "non_functional_requirements": ["scalability", "availability"]
-}}
+{_PROFILE_SCHEMA}
 
 Rules:
 - Extract budget in INR (estimate if not specified: small=3000, medium=8000, large=20000)
@@ -90,47 +202,16 @@ JSON:"""
 
     try:
         response = call_llm(prompt, max_tokens=1500)
-        
-        # Extract JSON from response
-        json_text = extract_json_from_text(response)
-        
-        profile = json.loads(json_text)
-        
-        # Validate and fix required fields
-        if 'name' not in profile:
-            profile['name'] = "Cloud Project"
-        
-        if 'budget_inr_per_month' not in profile:
-            profile['budget_inr_per_month'] = 5000
-        else:
-            profile['budget_inr_per_month'] = float(str(profile['budget_inr_per_month']).replace(',', ''))
-        
-        if 'description' not in profile:
-            profile['description'] = description[:100]
-        
-        if 'tech_stack' not in profile or not isinstance(profile['tech_stack'], dict):
-            profile['tech_stack'] = {
-                "frontend": None,
-                "backend": None,
-                "database": None,
-                "proxy": None,
-                "hosting": None
-            }
-        
-        if 'non_functional_requirements' not in profile:
-            profile['non_functional_requirements'] = []
-        elif not isinstance(profile['non_functional_requirements'], list):
-            profile['non_functional_requirements'] = [profile['non_functional_requirements']]
-        
-        # Normalize tech stack values
-        for key, value in profile['tech_stack'].items():
-            if isinstance(value, str):
-                profile['tech_stack'][key] = value.lower()
-        
-        print(f"  ✓ Extracted profile for: {profile['name']}")
-        print(f"  ✓ Budget: ₹{profile['budget_inr_per_month']:,.2f}/month")
-        
-        return profile
+
+        # Fast path: the prompt demands bare JSON, so most responses
+        # parse directly without the extraction scan
+        try:
+            profile = json.loads(response.strip())
+        except json.JSONDecodeError:
+            json_text = extract_json_from_text(response)
+            profile = json.loads(json_text)
+
+        return _normalize_profile(profile, description)
         
     except json.JSONDecodeError as e:
         print(f"\n⚠️ Could not parse JSON from LLM. Creating profile from description...")
@@ -142,27 +223,199 @@ JSON:"""
         print(f"Creating fallback profile from description...")
         return create_fallback_profile(description)
 
+# Keys every normalized profile carries
+_REQUIRED_PROFILE_KEYS = ('name', 'budget_inr_per_month', 'description',
+                          'tech_stack', 'non_functional_requirements')
+
+def _profile_is_normalized(profile):
+    """
+    Check whether a parsed profile already matches the normalized schema
+
+    Args:
+        profile: Parsed profile dictionary from the LLM
+
+    Returns:
+        bool: True when no normalization mutation is needed
+    """
+    if not all(key in profile for key in _REQUIRED_PROFILE_KEYS):
+        return False
+    if not isinstance(profile['budget_inr_per_month'], (int, float)):
+        return False
+    if not isinstance(profile['tech_stack'], dict):
+        return False
+    for value in profile['tech_stack'].values():
+        if isinstance(value, str) and not value.islower():
+            return False
+    return isinstance(profile['non_functional_requirements'], list)
+
+def _normalize_profile(profile, description):
+    """
+    Validate and fix the required fields of an extracted profile
+
+    Well-formed profiles (the common case, given the schema in the
+    prompt) skip the mutation pass entirely.
+
+    Args:
+        profile: Parsed profile dictionary from the LLM
+        description: Original description text (for fallback values)
+
+    Returns:
+        dict: Normalized project profile
+    """
+    if _profile_is_normalized(profile):
+        print(f"  ✓ Extracted profile for: {profile['name']}")
+        print(f"  ✓ Budget: ₹{profile['budget_inr_per_month']:,.2f}/month")
+        return profile
+
+    # Validate and fix required fields (setdefault is one C-level call
+    # per key instead of a lookup followed by an assignment)
+    profile.setdefault('name', "Cloud Project")
+    profile.setdefault('description', description[:100])
+
+    budget = profile.setdefault('budget_inr_per_month', 5000)
+    if not isinstance(budget, (int, float)):
+        profile['budget_inr_per_month'] = float(str(budget).replace(',', ''))
+
+    if 'tech_stack' not in profile or not isinstance(profile['tech_stack'], dict):
+        profile['tech_stack'] = {
+            "frontend": None,
+            "backend": None,
+            "database": None,
+            "proxy": None,
+            "hosting": None
+        }
+
+    requirements = profile.setdefault('non_functional_requirements', [])
+    if not isinstance(requirements, list):
+        profile['non_functional_requirements'] = [requirements]
+
+    # Normalize tech stack values (one C-level dict build instead of
+    # per-item write-backs into the dict being iterated)
+    profile['tech_stack'] = {
+        key: value.lower() if isinstance(value, str) else value
+        for key, value in profile['tech_stack'].items()
+    }
+
+    print(f"  ✓ Extracted profile for: {profile['name']}")
+    print(f"  ✓ Budget: ₹{profile['budget_inr_per_month']:,.2f}/month")
+
+    return profile
+
+def extract_project_profiles(descriptions):
+    """
+    Extract profiles for several descriptions with a single LLM call
+
+    One batched round-trip replaces N sequential ones, so multi-project
+    runs pay network latency once instead of per description.
+
+    Args:
+        descriptions: List of free-form project description texts
+
+    Returns:
+        list: Normalized project profiles, one per description
+    """
+    if not descriptions:
+        return []
+
+    numbered = "\n\n".join(
+        f"Description {idx}:\n{desc}" for idx, desc in enumerate(descriptions, 1)
+    )
+
+    prompt = f"""Extract project information for each of the {len(descriptions)} project descriptions below and return ONLY a JSON array with one object per description, IN THE SAME ORDER.
+
+{numbered}
+
+Each object must have this exact structure:
+{_PROFILE_SCHEMA}
+
+Rules:
+- Extract budget in INR (estimate if not specified: small=3000, medium=8000, large=20000)
+- List all technologies mentioned
+- Include requirements like scalability, high availability, security
+- Return ONLY a valid JSON array, no explanations
+
+JSON Array:"""
+
+    try:
+        response = call_llm(
+            prompt,
+            max_tokens=min(1500 * len(descriptions), GROQ_MAX_COMPLETION_TOKENS)
+        )
+
+        json_text = extract_json_from_text(response)
+        profiles = json.loads(json_text)
+
+        if not isinstance(profiles, list) or len(profiles) != len(descriptions):
+            raise ValueError(
+                f"Expected {len(descriptions)} profiles, got "
+                f"{len(profiles) if isinstance(profiles, list) else type(profiles).__name__}"
+            )
+
+        return [
+            _normalize_profile(profile, description)
+            for profile, description in zip(profiles, descriptions)
+        ]
+
+    except Exception as e:
+        print(f"\n⚠️ Batched extraction failed ({str(e)}). Extracting one by one...")
+        return [extract_project_profile(description) for description in descriptions]
+
+# Keyword → tech value per category, in priority order (the first keyword
+# found wins, matching the old if/elif chains). All keywords are folded
+# into one compiled alternation so the description is scanned once
+# instead of once per keyword; longest-first ordering makes overlapping
+# keywords (nodejs/node, mongodb/mongo) match deterministically.
+_TECH_KEYWORDS = {
+    'frontend': [('react', 'react'), ('angular', 'angular'), ('vue', 'vue')],
+    'backend': [('node', 'nodejs'), ('nodejs', 'nodejs'),
+                ('python', 'python'), ('django', 'python'), ('java', 'java')],
+    'database': [('mongodb', 'mongodb'), ('mongo', 'mongodb'),
+                 ('postgres', 'postgresql'), ('postgresql', 'postgresql'),
+                 ('mysql', 'mysql')],
+    'proxy': [('nginx', 'nginx'), ('apache', 'apache')],
+    'hosting': [('aws', 'aws'), ('azure', 'azure'),
+                ('gcp', 'gcp'), ('google cloud', 'gcp')],
+}
+# Budget amounts like "8000 rupees" / "5000 INR", compiled once at import.
+# IGNORECASE lets the scans run over the original text, skipping the
+# full lowercased copy of the description.
+_BUDGET_WORD_RE = re.compile(r'budget', re.IGNORECASE)
+_BUDGET_RE = re.compile(r'(\d+)\s*(?:rupees|inr|rs)', re.IGNORECASE)
+
+_REQUIREMENT_KEYWORDS = [
+    ('scalab', 'scalability'),
+    ('availab', 'high availability'),
+    ('security', 'security'),
+]
+_TECH_KEYWORD_RE = re.compile('|'.join(sorted(
+    {keyword for candidates in _TECH_KEYWORDS.values() for keyword, _ in candidates}
+    | {keyword for keyword, _ in _REQUIREMENT_KEYWORDS},
+    key=len, reverse=True
+)), re.IGNORECASE)
+
 def create_fallback_profile(description):
     """
     Create a basic profile when LLM fails
-    
+
     Args:
         description: Project description text
-    
+
     Returns:
         dict: Basic project profile
     """
-    desc_lower = description.lower()
-    
     # Extract budget
     budget = 5000  # Default
-    if 'budget' in desc_lower:
-        import re
-        budget_match = re.search(r'(\d+)\s*(?:rupees|inr|rs)', desc_lower)
+    if _BUDGET_WORD_RE.search(description):
+        budget_match = _BUDGET_RE.search(description)
         if budget_match:
             budget = int(budget_match.group(1))
     
-    # Detect technologies
+    # Detect technologies and requirements with one pass over the text:
+    # every keyword hit is collected by a single case-insensitive scan
+    # (no lowercased copy of the description), then each category
+    # resolves in priority order from the hit set
+    found = {match.lower() for match in _TECH_KEYWORD_RE.findall(description)}
+
     tech_stack = {
         "frontend": None,
         "backend": None,
@@ -170,49 +423,15 @@ def create_fallback_profile(description):
         "proxy": None,
         "hosting": None
     }
-    
-    if 'react' in desc_lower:
-        tech_stack['frontend'] = 'react'
-    elif 'angular' in desc_lower:
-        tech_stack['frontend'] = 'angular'
-    elif 'vue' in desc_lower:
-        tech_stack['frontend'] = 'vue'
-    
-    if 'node' in desc_lower or 'nodejs' in desc_lower:
-        tech_stack['backend'] = 'nodejs'
-    elif 'python' in desc_lower or 'django' in desc_lower:
-        tech_stack['backend'] = 'python'
-    elif 'java' in desc_lower:
-        tech_stack['backend'] = 'java'
-    
-    if 'mongodb' in desc_lower or 'mongo' in desc_lower:
-        tech_stack['database'] = 'mongodb'
-    elif 'postgres' in desc_lower or 'postgresql' in desc_lower:
-        tech_stack['database'] = 'postgresql'
-    elif 'mysql' in desc_lower:
-        tech_stack['database'] = 'mysql'
-    
-    if 'nginx' in desc_lower:
-        tech_stack['proxy'] = 'nginx'
-    elif 'apache' in desc_lower:
-        tech_stack['proxy'] = 'apache'
-    
-    if 'aws' in desc_lower:
-        tech_stack['hosting'] = 'aws'
-    elif 'azure' in desc_lower:
-        tech_stack['hosting'] = 'azure'
-    elif 'gcp' in desc_lower or 'google cloud' in desc_lower:
-        tech_stack['hosting'] = 'gcp'
-    
-    # Detect requirements
-    requirements = []
-    if 'scalab' in desc_lower:
-        requirements.append('scalability')
-    if 'availab' in desc_lower:
-        requirements.append('high availability')
-    if 'security' in desc_lower:
-        requirements.append('security')
-    
+
+    for category, candidates in _TECH_KEYWORDS.items():
+        for keyword, value in candidates:
+            if keyword in found:
+                tech_stack[category] = value
+                break
+
+    requirements = [name for keyword, name in _REQUIREMENT_KEYWORDS if keyword in found]
+
     profile = {
         "name": "Cloud Application",
         "budget_inr_per_month": budget,